@@ -11,19 +11,68 @@ AstrBot 青龙面板管理插件
 版本: 1.0.1
 """
 
+import asyncio
+import json
+import os
 import time
-from typing import Dict, List, Optional, Tuple, Any
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
 import httpx
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:  # 环境里装不上 orjson 时退回标准库，慢一些但行为一致
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
 from astrbot.api.event import filter, AstrMessageEvent
-from astrbot.api.star import Context, Star, register
+from astrbot.api.star import Context, Star, StarTools, register
 from astrbot.api import logger
 
 
 # 常量配置
 DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_CONCURRENCY = 8  # 同时在途请求上限，避免压垮面板或耗尽连接池
 TOKEN_EXPIRE_SECONDS = 6 * 24 * 3600  # 6天
+TOKEN_SAFETY_MARGIN = 300  # 提前5分钟视为过期，避免请求途中失效
+ENV_CACHE_TTL = 30  # id→环境变量 缓存有效期（秒）
+LIST_CACHE_TTL = 5.0  # 列表端点短缓存有效期（秒），翻页/连续操作直接命中
+LOG_TAIL_CHARS = 1000  # 任务日志只保留末尾的字符数
+
+# 置顶类操作（回复用 📌 图标）
+_PIN_ACTIONS = frozenset({"pin", "unpin"})
+
+# 预置的状态/结果图标表，按下标取用，省去每行的条件分支和新字符串
+STATUS_ICON = ("🟢", "🔴")  # [0]=启用, [1]=禁用
+RESULT_ICON = ("❌", "✅")  # 按 bool(success) 取
+
+HELP_TEXT = """📦 青龙面板管理插件 v1.0.1
+
+📋 环境变量:
+/ql envs [关键词] [页码] - 查看环境变量
+/ql add <名称> <值> [备注] - 添加
+/ql update <名称> <值> - 更新（按名称）
+/ql update id:<ID> <值> - 更新（按ID）
+/ql delete <名称> - 删除
+/ql enable/disable <名称> - 启用/禁用
+
+⏰ 定时任务:
+/ql ls [页码] - 查看任务列表
+/ql run <任务ID...> - 执行任务（可多个）
+/ql stop <任务ID...> - 停止任务（可多个）
+/ql log <任务ID> - 查看日志
+/ql cron enable/disable <任务ID...> - 启用/禁用
+/ql cron pin/unpin <任务ID...> - 置顶/取消
+/ql cron delete <任务ID...> - 删除任务
+
+📊 系统信息:
+/ql info - 查看系统信息"""
 
 
 class QinglongAPI:
@@ -32,43 +81,159 @@ class QinglongAPI:
     使用共享的 HTTP 客户端以复用连接池，提高性能。
     """
     
-    def __init__(self, host: str, client_id: str, client_secret: str):
+    def __init__(
+        self, host: str, client_id: str, client_secret: str,
+        token_cache: Optional[str] = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ):
         """初始化青龙 API"""
         self.host = host.rstrip('/')
         self.client_id = client_id
         self.client_secret = client_secret
         self.token: Optional[str] = None
         self.token_expire: float = 0
+        self._token_deadline: Optional[float] = None
         self._client: Optional[httpx.AsyncClient] = None
-    
+        self._limits = httpx.Limits(
+            max_connections=20, max_keepalive_connections=10, keepalive_expiry=60
+        )
+        self._headers: Dict[str, str] = {"Authorization": "", "Content-Type": "application/json"}
+        self._token_cache = token_cache
+        self._token_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._sem = asyncio.Semaphore(max(1, max_concurrency))
+        self._env_by_id: Dict[int, Dict] = {}
+        self._env_cache_ts: float = 0
+        self._list_cache: Dict[Tuple, Tuple[float, List[Dict], int, bool]] = {}
+        self._load_cached_token()
+
+    def _load_cached_token(self):
+        """从磁盘加载缓存的 token，插件重载后可免去一次认证请求"""
+        if not self._token_cache:
+            return
+        try:
+            with open(self._token_cache, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if time.time() < cached.get("token_expire", 0) - TOKEN_SAFETY_MARGIN:
+                self.token = cached.get("token")
+                self.token_expire = cached.get("token_expire", 0)
+                self._headers["Authorization"] = f"Bearer {self.token}"
+        except (OSError, ValueError):
+            pass
+
+    def _save_cached_token(self):
+        """把 token 原子地写入磁盘缓存"""
+        if not self._token_cache:
+            return
+        try:
+            os.makedirs(os.path.dirname(self._token_cache), exist_ok=True)
+            tmp_path = f"{self._token_cache}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"token": self.token, "token_expire": self.token_expire}, f)
+            os.replace(tmp_path, self._token_cache)
+        except OSError as e:
+            logger.warning(f"写入token缓存失败: {e}")
+
     async def _get_client(self) -> httpx.AsyncClient:
-        """获取或创建 HTTP 客户端（复用连接池）"""
+        """获取或创建 HTTP 客户端（复用连接池）
+
+        延迟到事件循环内创建，避免插件重载后复用挂在旧循环上的客户端。
+        """
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT)
+            self._client = httpx.AsyncClient(
+                base_url=self.host,
+                timeout=DEFAULT_TIMEOUT,
+                http2=True,
+                limits=self._limits,
+                headers=self._headers,
+            )
         return self._client
-    
+
     async def close(self):
-        """关闭 HTTP 客户端"""
+        """关闭 HTTP 客户端并停掉后台刷新任务"""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            self._refresh_task = None
         if self._client and not self._client.is_closed:
             await self._client.aclose()
             self._client = None
+
+    async def __aenter__(self) -> "QinglongAPI":
+        await self._get_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
     
     async def get_token(self) -> bool:
-        """获取访问令牌"""
-        try:
-            if self.token and time.time() < self.token_expire:
+        """获取访问令牌
+
+        无锁快路径检查有效期；过期时加锁双重检查（single-flight），
+        并发命令同时触发刷新时只有第一个协程真正请求认证端点，
+        其余等锁后直接复用它写入的结果。
+        """
+        if self._token_valid():
+            self._start_refresher()
+            return True
+        async with self._token_lock:
+            if self._token_valid():
                 return True
-            
+            return await self._fetch_token()
+
+    def _token_valid(self) -> bool:
+        """用事件循环的单调时钟判断 token 是否仍在安全期内
+
+        挂钟（time.time）会被 NTP 调整，可能造成提前或延后刷新；
+        过期时间仍按挂钟持久化到磁盘，首次在循环内使用时换算成
+        单调时钟刻度。
+        """
+        if not self.token:
+            return False
+        loop_now = asyncio.get_running_loop().time()
+        if self._token_deadline is None:
+            self._token_deadline = loop_now + (self.token_expire - time.time())
+        return loop_now < self._token_deadline - TOKEN_SAFETY_MARGIN
+
+    def _start_refresher(self):
+        """启动后台刷新任务（幂等），在过期前主动换新 token"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(self._token_refresher())
+
+    async def _token_refresher(self):
+        """睡到过期前的安全边界，再主动刷新 token
+
+        让刷新成本由后台任务承担，用户命令不会撞上过期边界。
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            deadline = self._token_deadline if self._token_deadline is not None else 0
+            delay = max(60.0, deadline - loop.time() - TOKEN_SAFETY_MARGIN)
+            await asyncio.sleep(delay)
+            self.token = None
+            self._token_deadline = None
+            await self.get_token()
+
+    async def _fetch_token(self) -> bool:
+        """请求认证端点并更新本地 token 状态"""
+        try:
             client = await self._get_client()
             response = await client.get(
-                f"{self.host}/open/auth/token",
+                "/open/auth/token",
                 params={"client_id": self.client_id, "client_secret": self.client_secret}
             )
-            result = response.json()
+            result = _json_loads(response.content)
             
             if result.get('code') == 200:
                 self.token = result['data']['token']
-                self.token_expire = time.time() + TOKEN_EXPIRE_SECONDS
+                # 优先采用服务端返回的过期时间，没有再按 6 天兜底
+                expiration = result['data'].get('expiration')
+                self.token_expire = expiration if expiration else time.time() + TOKEN_EXPIRE_SECONDS
+                self._token_deadline = asyncio.get_running_loop().time() + (self.token_expire - time.time())
+                self._headers["Authorization"] = f"Bearer {self.token}"
+                if self._client and not self._client.is_closed:
+                    # 同步到共享客户端的默认请求头，单次请求不再做 header 合并
+                    self._client.headers.update(self._headers)
+                self._save_cached_token()
+                self._start_refresher()
                 return True
             else:
                 logger.error(f"获取token失败: {result.get('message')}")
@@ -84,143 +249,307 @@ class QinglongAPI:
             logger.error(f"获取token异常: {e}")
             return False
     
-    def _get_headers(self) -> Dict[str, str]:
-        """获取请求头"""
-        return {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
-    
     async def _request(
-        self, 
-        method: str, 
-        endpoint: str, 
+        self,
+        method: str,
+        endpoint: str,
         params: Optional[Dict] = None,
-        json_data: Any = None
+        json_data: Any = None,
+        retries: int = 3,
+        parse_body: bool = True
     ) -> Tuple[bool, Any]:
         """统一的请求方法
-        
+
+        瞬时网络错误和 5xx 响应按指数退避重试；收到 401 时清除本地
+        token 重新认证后再试一次。调用方不关心响应数据时传
+        parse_body=False，成功响应只探测开头的 code 字段而不做完整
+        JSON 解析（失败时仍解析以取出错误信息）。
+
         Returns:
             (success, data) - 成功时返回 (True, data)，失败时返回 (False, error_message)
         """
-        if not await self.get_token():
+        # 只有完全没有 token 时才预先认证；过期交给后台刷新任务
+        # 和下面的 401 重试路径处理，热路径不做逐请求检查
+        if self.token is None and not await self.get_token():
             return False, "认证失败"
-        
-        try:
-            client = await self._get_client()
-            url = f"{self.host}{endpoint}"
-            
-            if method.upper() == "GET":
-                response = await client.get(url, headers=self._get_headers(), params=params)
-            elif method.upper() == "DELETE":
-                response = await client.request("DELETE", url, headers=self._get_headers(), json=json_data)
-            elif method.upper() == "PUT":
-                response = await client.put(url, headers=self._get_headers(), json=json_data)
-            else:  # POST
-                response = await client.post(url, headers=self._get_headers(), json=json_data)
-            
-            result = response.json()
-            
-            if result.get('code') == 200:
-                return True, result.get('data', {})
-            else:
-                return False, result.get('message', '未知错误')
-                
-        except httpx.TimeoutException:
-            return False, "请求超时"
-        except httpx.ConnectError:
-            return False, "连接失败"
-        except Exception as e:
-            return False, str(e)
+
+        method = method.upper()
+        reauthed = False
+        last_error = "请求失败"
+        # 请求体只编码一次（orjson 直接产出 bytes），重试时复用；
+        # base_url/认证头都挂在共享客户端上，任何方法都走同一个 request 调用
+        content = _json_dumps(json_data) if json_data is not None else None
+
+        for attempt in range(retries):
+            try:
+                client = await self._get_client()
+                async with self._sem:
+                    response = await client.request(method, endpoint, params=params, content=content)
+
+                if response.status_code == 401 and not reauthed:
+                    # token 已在服务端失效，重新认证后立即重试
+                    self.token = None
+                    self._token_deadline = None
+                    reauthed = True
+                    if not await self.get_token():
+                        return False, "认证失败"
+                    continue
+
+                if response.status_code >= 500:
+                    last_error = f"服务端错误 ({response.status_code})"
+                else:
+                    if not parse_body and response.status_code == 200:
+                        head = response.content[:64]
+                        if b'"code":200' in head or b'"code": 200' in head:
+                            return True, {}
+                    result = _json_loads(response.content)
+                    if result.get('code') == 200:
+                        return True, result.get('data', {})
+                    return False, result.get('message', '未知错误')
+
+            except httpx.TimeoutException:
+                last_error = "请求超时"
+            except httpx.TransportError:
+                last_error = "连接失败"
+            except Exception as e:
+                return False, str(e)
+
+            if attempt < retries - 1:
+                await asyncio.sleep(0.2 * 2 ** attempt)
+
+        return False, last_error
     
-    async def get_envs(self, search_value: str = "") -> List[Dict]:
-        """获取环境变量列表"""
-        params = {"searchValue": search_value} if search_value else None
-        success, data = await self._request("GET", "/open/envs", params=params)
-        
+    async def _batch(self, endpoint: str, ids: List[int], ok_msg: str, method: str = "PUT") -> Tuple[bool, str]:
+        """批量 id 操作的统一入口
+
+        启用/禁用/执行/删除等端点的请求体都是一个 id 列表，
+        共用同一套请求和结果处理逻辑。
+        """
+        success, data = await self._request(method, endpoint, json_data=ids, parse_body=False)
+        if success:
+            self._invalidate_cache("/open/envs" if endpoint.startswith("/open/envs") else "/open/crons")
+        return success, ok_msg if success else data
+
+    def _invalidate_cache(self, prefix: str):
+        """清除某一端点前缀下的列表缓存（写操作成功后调用）"""
+        self._list_cache = {k: v for k, v in self._list_cache.items() if not k[0].startswith(prefix)}
+        if prefix.startswith("/open/envs"):
+            self._env_cache_ts = 0
+
+    @staticmethod
+    def _unpack_list(success: bool, data: Any) -> Tuple[List[Dict], int, bool]:
+        """把列表端点的响应统一成 (列表, 总数, 是否服务端分页)
+
+        服务端分页时响应是 {"data": [...], "total": N}；
+        旧版本直接返回整个列表，此时总数就是列表长度，
+        分页（如有）需要调用方本地切片。
+        """
         if not success:
-            return []
-        
+            return [], 0, False
         if isinstance(data, dict):
-            return data.get('data', [])
-        return data if isinstance(data, list) else []
+            items = data.get('data', [])
+            return items, data.get('total', len(items)), True
+        items = data if isinstance(data, list) else []
+        return items, len(items), False
+
+    async def get_envs(
+        self, search_value: str = "", page: Optional[int] = None, size: Optional[int] = None
+    ) -> Tuple[List[Dict], int, bool]:
+        """获取环境变量列表，传入 page/size 时由服务端分页
+
+        旧版面板会忽略分页参数并返回全量列表，第三个返回值标记
+        服务端是否分页，为 False 时调用方退回本地切片；结果按
+        (搜索词, 页码, 页大小) 进入短 TTL 缓存。
+        """
+        key = ("/open/envs", search_value, page, size)
+        cached = self._list_cache.get(key)
+        if cached and time.monotonic() - cached[0] < LIST_CACHE_TTL:
+            return cached[1], cached[2], cached[3]
+
+        params: Dict[str, Any] = {}
+        if search_value:
+            params["searchValue"] = search_value
+        if page is not None:
+            params["page"] = page
+            params["size"] = size
+        success, data = await self._request("GET", "/open/envs", params=params or None)
+        items, total, paginated = self._unpack_list(success, data)
+        if success:
+            self._list_cache[key] = (time.monotonic(), items, total, paginated)
+            if not search_value and page is None:
+                # 全量列表顺手更新 id→env 缓存，供按 id 的操作直接命中
+                self._env_by_id = {env['id']: env for env in items if 'id' in env}
+                self._env_cache_ts = time.time()
+        return items, total, paginated
+
+    async def get_env_by_id(self, env_id: int) -> Optional[Dict]:
+        """按 id 查找环境变量
+
+        优先命中短 TTL 缓存；未命中时先试新版面板的单条查询端点
+        /open/envs/{id}，端点不可用再退回全量刷新。
+        """
+        if time.time() - self._env_cache_ts < ENV_CACHE_TTL and env_id in self._env_by_id:
+            return self._env_by_id[env_id]
+
+        success, data = await self._request("GET", f"/open/envs/{env_id}")
+        if success and isinstance(data, dict) and data.get('id') == env_id:
+            return data
+
+        await self.get_envs("")
+        return self._env_by_id.get(env_id)
     
     async def add_env(self, name: str, value: str, remarks: str = "") -> Tuple[bool, str]:
         """添加环境变量"""
         success, data = await self._request("POST", "/open/envs", json_data=[{"name": name, "value": value, "remarks": remarks}])
+        if success:
+            self._invalidate_cache("/open/envs")
         return success, "添加成功" if success else data
-    
+
     async def update_env(self, env_id: int, name: str, value: str, remarks: str = "") -> Tuple[bool, str]:
         """更新环境变量"""
         success, data = await self._request("PUT", "/open/envs", json_data={"id": env_id, "name": name, "value": value, "remarks": remarks})
+        if success:
+            self._invalidate_cache("/open/envs")
         return success, "更新成功" if success else data
     
-    async def delete_env(self, env_id: int) -> Tuple[bool, str]:
+    async def delete_env(self, env_ids: List[int]) -> Tuple[bool, str]:
         """删除环境变量"""
-        success, data = await self._request("DELETE", "/open/envs", json_data=[env_id])
-        return success, "删除成功" if success else data
-    
+        return await self._batch("/open/envs", env_ids, "删除成功", method="DELETE")
+
     async def enable_env(self, env_ids: List[int]) -> Tuple[bool, str]:
         """启用环境变量"""
-        success, data = await self._request("PUT", "/open/envs/enable", json_data=env_ids)
-        return success, "启用成功" if success else data
-    
+        return await self._batch("/open/envs/enable", env_ids, "启用成功")
+
     async def disable_env(self, env_ids: List[int]) -> Tuple[bool, str]:
         """禁用环境变量"""
-        success, data = await self._request("PUT", "/open/envs/disable", json_data=env_ids)
-        return success, "禁用成功" if success else data
+        return await self._batch("/open/envs/disable", env_ids, "禁用成功")
     
-    async def get_crons(self, search_value: str = "") -> List[Dict]:
-        """获取定时任务列表"""
-        params = {"searchValue": search_value} if search_value else None
-        success, data = await self._request("GET", "/open/crons", params=params)
-        
-        if not success:
-            return []
-        
-        if isinstance(data, dict):
-            return data.get('data', [])
-        return data if isinstance(data, list) else []
+    async def get_crons(
+        self, search_value: str = "", page: Optional[int] = None, size: Optional[int] = None
+    ) -> Tuple[List[Dict], int, bool]:
+        """获取定时任务列表，传入 page/size 时由服务端分页
+
+        分页参数的兼容性处理与 get_envs 相同。
+        """
+        key = ("/open/crons", search_value, page, size)
+        cached = self._list_cache.get(key)
+        if cached and time.monotonic() - cached[0] < LIST_CACHE_TTL:
+            return cached[1], cached[2], cached[3]
+
+        params: Dict[str, Any] = {}
+        if search_value:
+            params["searchValue"] = search_value
+        if page is not None:
+            params["page"] = page
+            params["size"] = size
+        success, data = await self._request("GET", "/open/crons", params=params or None)
+        items, total, paginated = self._unpack_list(success, data)
+        if success:
+            self._list_cache[key] = (time.monotonic(), items, total, paginated)
+        return items, total, paginated
     
     async def run_cron(self, cron_ids: List[int]) -> Tuple[bool, str]:
         """执行定时任务"""
-        success, data = await self._request("PUT", "/open/crons/run", json_data=cron_ids)
-        return success, "执行成功" if success else data
-    
+        return await self._batch("/open/crons/run", cron_ids, "执行成功")
+
     async def stop_cron(self, cron_ids: List[int]) -> Tuple[bool, str]:
         """停止定时任务"""
-        success, data = await self._request("PUT", "/open/crons/stop", json_data=cron_ids)
-        return success, "停止成功" if success else data
-    
+        return await self._batch("/open/crons/stop", cron_ids, "停止成功")
+
     async def enable_cron(self, cron_ids: List[int]) -> Tuple[bool, str]:
         """启用定时任务"""
-        success, data = await self._request("PUT", "/open/crons/enable", json_data=cron_ids)
-        return success, "启用成功" if success else data
-    
+        return await self._batch("/open/crons/enable", cron_ids, "启用成功")
+
     async def disable_cron(self, cron_ids: List[int]) -> Tuple[bool, str]:
         """禁用定时任务"""
-        success, data = await self._request("PUT", "/open/crons/disable", json_data=cron_ids)
-        return success, "禁用成功" if success else data
-    
+        return await self._batch("/open/crons/disable", cron_ids, "禁用成功")
+
     async def pin_cron(self, cron_ids: List[int]) -> Tuple[bool, str]:
         """置顶定时任务"""
-        success, data = await self._request("PUT", "/open/crons/pin", json_data=cron_ids)
-        return success, "置顶成功" if success else data
-    
+        return await self._batch("/open/crons/pin", cron_ids, "置顶成功")
+
     async def unpin_cron(self, cron_ids: List[int]) -> Tuple[bool, str]:
         """取消置顶定时任务"""
-        success, data = await self._request("PUT", "/open/crons/unpin", json_data=cron_ids)
-        return success, "取消置顶成功" if success else data
-    
+        return await self._batch("/open/crons/unpin", cron_ids, "取消置顶成功")
+
     async def delete_cron(self, cron_ids: List[int]) -> Tuple[bool, str]:
         """删除定时任务"""
-        success, data = await self._request("DELETE", "/open/crons", json_data=cron_ids)
-        return success, "删除成功" if success else data
+        return await self._batch("/open/crons", cron_ids, "删除成功", method="DELETE")
     
-    async def get_cron_log(self, cron_id: int) -> Tuple[bool, str]:
-        """获取定时任务日志"""
-        success, data = await self._request("GET", f"/open/crons/{cron_id}/log")
-        return success, data if success else data
+    async def get_cron_log(self, cron_id: int, tail_chars: int = LOG_TAIL_CHARS) -> Tuple[bool, str]:
+        """获取定时任务日志，流式下载并只保留末尾部分
+
+        长时间运行的任务日志可能有数 MB，而用户只看最后一屏；
+        流式读取让带宽和内存都只有尾部大小。
+        """
+        if self.token is None and not await self.get_token():
+            return False, "认证失败"
+
+        max_bytes = tail_chars * 4  # UTF-8 下一个字符最多4字节
+        try:
+            client = await self._get_client()
+            for attempt in range(2):
+                async with self._sem, client.stream("GET", f"/open/crons/{cron_id}/log") as response:
+                    if response.status_code == 401 and attempt == 0:
+                        # token 失效，与 _request 相同：重新认证后再试一次
+                        self.token = None
+                        self._token_deadline = None
+                        if not await self.get_token():
+                            return False, "认证失败"
+                        continue
+                    if response.status_code != 200:
+                        return False, f"HTTP {response.status_code}"
+                    # 用块队列维护尾部窗口：丢弃整块即可，不用每个块都搬移字节
+                    chunks: deque = deque()
+                    total = 0
+                    buffered = 0
+                    async for chunk in response.aiter_bytes(65536):
+                        total += len(chunk)
+                        chunks.append(chunk)
+                        buffered += len(chunk)
+                        while chunks and buffered - len(chunks[0]) >= max_bytes:
+                            buffered -= len(chunks.popleft())
+                break
+
+            tail = b"".join(chunks)
+            if len(tail) > max_bytes:
+                tail = tail[-max_bytes:]
+
+            if total == len(tail):
+                # 响应没有超出尾部上限，按原有的 JSON 包裹解析
+                try:
+                    result = _json_loads(tail)
+                except ValueError:
+                    result = None
+                if isinstance(result, dict):
+                    if result.get('code') != 200:
+                        return False, result.get('message', '未知错误')
+                    data = result.get('data', '')
+                    text = data if isinstance(data, str) else str(data)
+                    return True, text[-tail_chars:]
+
+            # 响应过大已被截断，截到的是 JSON 包裹里 data 字符串的尾部：
+            # 去掉包裹收尾的 "}，再按 JSON 字符串解码还原 \n 等转义
+            if tail.endswith(b'"}'):
+                fragment = tail[:-2]
+                # 截断点可能落在多字节字符中间，跳过开头残缺的续字节
+                start = 0
+                while start < len(fragment) and fragment[start] & 0xC0 == 0x80:
+                    start += 1
+                try:
+                    text = _json_loads(b'"' + fragment[start:] + b'"')
+                except ValueError:
+                    text = None
+                if isinstance(text, str):
+                    return True, text[-tail_chars:]
+            return True, tail.decode('utf-8', errors='ignore')[-tail_chars:]
+
+        except httpx.TimeoutException:
+            return False, "请求超时"
+        except httpx.TransportError:
+            return False, "连接失败"
+        except Exception as e:
+            return False, str(e)
     
     async def get_system_info(self) -> Optional[Dict]:
         """获取系统信息"""
@@ -233,7 +562,42 @@ class QinglongPlugin(Star):
     """AstrBot 青龙插件主类"""
     
     PAGE_SIZE = 10
-    
+
+    # 命令路由表（类级常量，不随消息重建）；别名映射到同一个方法名
+    _HANDLERS: ClassVar[Dict[str, str]] = {
+        "help": "_handle_help",
+        "envs": "_handle_envs",
+        "list": "_handle_envs",
+        "add": "_handle_add_env",
+        "update": "_handle_update_env",
+        "delete": "_handle_delete_env",
+        "enable": "_handle_enable_env",
+        "disable": "_handle_disable_env",
+        "ls": "_handle_crons",
+        "run": "_handle_run_cron",
+        "stop": "_handle_stop_cron",
+        "log": "_handle_cron_log",
+        "cron": "_handle_cron_action",
+        "info": "_handle_info",
+    }
+
+    # cron 子操作 → (QinglongAPI 方法名, 动作中文名)
+    _CRON_ACTIONS: ClassVar[Dict[str, Tuple[str, str]]] = {
+        "enable": ("enable_cron", "启用"),
+        "disable": ("disable_cron", "禁用"),
+        "pin": ("pin_cron", "置顶"),
+        "unpin": ("unpin_cron", "取消置顶"),
+        "delete": ("delete_cron", "删除"),
+    }
+
+    # 合法子命令集合：未知命令的快速拒绝路径只做一次哈希查找
+    _VALID_COMMANDS: ClassVar[frozenset] = frozenset(_HANDLERS)
+
+    @staticmethod
+    def _parse_ids(parts: list) -> List[int]:
+        """解析命令里的 ID 列表，支持空格或逗号分隔（如 `1,2 3`）"""
+        return [int(x) for chunk in parts for x in chunk.split(',') if x]
+
     def __init__(self, context: Context, config: dict):
         """初始化插件"""
         super().__init__(context)
@@ -243,8 +607,18 @@ class QinglongPlugin(Star):
         ql_client_id = config.get("qinglong_client_id", "")
         ql_client_secret = config.get("qinglong_client_secret", "")
         
-        self.ql_api = QinglongAPI(ql_host, ql_client_id, ql_client_secret)
-        
+        try:
+            token_cache = os.path.join(StarTools.get_data_dir("astrbot_plugin_qinglong"), "token.json")
+        except Exception:
+            token_cache = None
+
+        max_concurrency = config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)
+
+        self.ql_api = QinglongAPI(
+            ql_host, ql_client_id, ql_client_secret,
+            token_cache=token_cache, max_concurrency=max_concurrency
+        )
+
         logger.info("青龙面板插件已加载")
         logger.info(f"  Host: {ql_host}")
     
@@ -255,61 +629,44 @@ class QinglongPlugin(Star):
             yield event.plain_result("❌ 插件未正确初始化，请检查配置")
             return
         
-        parts = event.message_str.strip().split()
+        message = event.message_str.strip()
+        parts = message.split()
         command = parts[1].lower() if len(parts) > 1 else "help"
-        
-        # 命令路由
-        handlers = {
-            "help": self._handle_help,
-            "envs": self._handle_envs,
-            "list": self._handle_envs,
-            "add": self._handle_add_env,
-            "update": self._handle_update_env,
-            "delete": self._handle_delete_env,
-            "enable": self._handle_enable_env,
-            "disable": self._handle_disable_env,
-            "ls": self._handle_crons,
-            "run": self._handle_run_cron,
-            "stop": self._handle_stop_cron,
-            "log": self._handle_cron_log,
-            "cron": self._handle_cron_action,
-            "info": self._handle_info,
-        }
-        
-        handler = handlers.get(command)
-        if handler:
-            async for result in handler(event, parts):
-                yield result
-        else:
+
+        # 未知命令尽早拒绝，不做后面的尾部截取和 ctx 构建
+        if command not in self._VALID_COMMANDS:
             yield event.plain_result(f"❌ 未知命令: {command}\n使用 /ql 查看帮助")
-    
-    async def _handle_help(self, event: AstrMessageEvent, parts: list):
-        """显示帮助信息"""
-        help_text = """📦 青龙面板管理插件 v1.0.1
+            return
 
-📋 环境变量:
-/ql envs [关键词] [页码] - 查看环境变量
-/ql add <名称> <值> [备注] - 添加
-/ql update <名称> <值> - 更新（按名称）
-/ql update id:<ID> <值> - 更新（按ID）
-/ql delete <名称> - 删除
-/ql enable/disable <名称> - 启用/禁用
+        # update/add 的值、备注尾部直接从原始消息按 maxsplit 截取：
+        # 不用 split 完再 join 回去，连续空格也原样保留
+        tail3 = tail4 = ""
+        if command == "update":
+            head = message.split(None, 3)
+            tail3 = head[3] if len(head) > 3 else ""
+        elif command == "add":
+            head = message.split(None, 4)
+            tail4 = head[4] if len(head) > 4 else ""
 
-⏰ 定时任务:
-/ql ls [页码] - 查看任务列表
-/ql run <任务ID> - 执行任务
-/ql stop <任务ID> - 停止任务
-/ql log <任务ID> - 查看日志
-/ql cron enable/disable <任务ID> - 启用/禁用
-/ql cron pin/unpin <任务ID> - 置顶/取消
-/ql cron delete <任务ID> - 删除任务
+        # 只解析一次：子命令、参数和尾部统一放进 ctx
+        ctx = SimpleNamespace(
+            parts=parts,
+            cmd=command,
+            args=parts[2:],
+            joined_from3=tail3,
+            joined_from4=tail4,
+        )
 
-📊 系统信息:
-/ql info - 查看系统信息"""
-        yield event.plain_result(help_text)
+        async for result in getattr(self, self._HANDLERS[command])(event, ctx):
+            yield result
+    
+    async def _handle_help(self, event: AstrMessageEvent, ctx: SimpleNamespace):
+        """显示帮助信息"""
+        yield event.plain_result(HELP_TEXT)
     
-    async def _handle_envs(self, event: AstrMessageEvent, parts: list):
+    async def _handle_envs(self, event: AstrMessageEvent, ctx: SimpleNamespace):
         """查看环境变量列表"""
+        parts = ctx.parts
         search_value = ""
         page = 1
         
@@ -321,61 +678,67 @@ class QinglongPlugin(Star):
                 if len(parts) > 3 and parts[3].isdigit():
                     page = int(parts[3])
         
-        envs = await self.ql_api.get_envs(search_value)
-        
-        if not envs:
+        envs, total, paginated = await self.ql_api.get_envs(search_value, page=page, size=self.PAGE_SIZE)
+
+        if not envs and not total:
             msg = f"❌ 未找到包含 '{search_value}' 的环境变量" if search_value else "📭 暂无环境变量"
             yield event.plain_result(msg)
             return
-        
-        total = len(envs)
-        start = (page - 1) * self.PAGE_SIZE
-        page_envs = envs[start:start + self.PAGE_SIZE]
-        
+
+        if not paginated:
+            # 服务端未做分页（旧版本面板），退回本地切片
+            total = len(envs)
+            start = (page - 1) * self.PAGE_SIZE
+            page_envs = envs[start:start + self.PAGE_SIZE]
+        else:
+            page_envs = envs
+
+        total_pages = -(-total // self.PAGE_SIZE)
         if not page_envs:
-            yield event.plain_result(f"❌ 页码超出范围 (共 {(total + self.PAGE_SIZE - 1) // self.PAGE_SIZE} 页)")
+            yield event.plain_result(f"❌ 页码超出范围 (共 {total_pages} 页)")
             return
-        
+
         search_info = f" (搜索: {search_value})" if search_value else ""
-        result = f"📋 环境变量列表{search_info} (第 {page} 页，共 {total} 个):\n\n"
-        
+        lines = [f"📋 环境变量列表{search_info} (第 {page} 页，共 {total} 个):\n\n"]
+
         for env in page_envs:
-            status = "🟢" if env.get('status') == 0 else "🔴"
+            status = STATUS_ICON[0 if env.get('status') == 0 else 1]
             value = env.get('value', '')
-            result += f"{status} {env.get('name')}\n"
-            result += f"  ID: {env.get('id')}\n"
-            result += f"  值: {value[:50]}{'...' if len(value) > 50 else ''}\n"
+            lines.append(f"{status} {env.get('name')}\n")
+            lines.append(f"  ID: {env.get('id')}\n")
+            lines.append(f"  值: {value[:50]}{'...' if len(value) > 50 else ''}\n")
             if env.get('remarks'):
-                result += f"  备注: {env.get('remarks')}\n"
-            result += "\n"
-        
-        total_pages = (total + self.PAGE_SIZE - 1) // self.PAGE_SIZE
+                lines.append(f"  备注: {env.get('remarks')}\n")
+            lines.append("\n")
+
         if page < total_pages:
             next_cmd = f"/ql envs {search_value} {page + 1}" if search_value else f"/ql envs {page + 1}"
-            result += f"💡 使用 {next_cmd} 查看下一页"
-        
-        yield event.plain_result(result)
+            lines.append(f"💡 使用 {next_cmd} 查看下一页")
+
+        yield event.plain_result("".join(lines))
     
-    async def _handle_add_env(self, event: AstrMessageEvent, parts: list):
+    async def _handle_add_env(self, event: AstrMessageEvent, ctx: SimpleNamespace):
         """添加环境变量"""
+        parts = ctx.parts
         if len(parts) < 4:
             yield event.plain_result("使用方法: /ql add <变量名> <变量值> [备注]")
             return
         
         name, value = parts[2], parts[3]
-        remarks = " ".join(parts[4:]) if len(parts) > 4 else ""
+        remarks = ctx.joined_from4
         
         success, msg = await self.ql_api.add_env(name, value, remarks)
-        yield event.plain_result(f"{'✅' if success else '❌'} {msg}: {name}")
+        yield event.plain_result(f"{RESULT_ICON[success]} {msg}: {name}")
     
-    async def _handle_update_env(self, event: AstrMessageEvent, parts: list):
+    async def _handle_update_env(self, event: AstrMessageEvent, ctx: SimpleNamespace):
         """更新环境变量"""
+        parts = ctx.parts
         if len(parts) < 4:
             yield event.plain_result("使用方法:\n/ql update <变量名> <值>\n/ql update id:<ID> <值>")
             return
         
         name_or_id = parts[2]
-        value = " ".join(parts[3:])  # 值可能包含空格
+        value = ctx.joined_from3  # 值可能包含空格
         
         # 按 ID 更新
         if name_or_id.startswith("id:"):
@@ -385,9 +748,8 @@ class QinglongPlugin(Star):
                 yield event.plain_result(f"❌ 无效的ID格式: {name_or_id}")
                 return
             
-            all_envs = await self.ql_api.get_envs("")
-            target_env = next((e for e in all_envs if e.get('id') == env_id), None)
-            
+            target_env = await self.ql_api.get_env_by_id(env_id)
+
             if not target_env:
                 yield event.plain_result(f"❌ 未找到ID为 {env_id} 的环境变量")
                 return
@@ -400,7 +762,7 @@ class QinglongPlugin(Star):
             return
         
         # 按名称更新
-        envs = await self.ql_api.get_envs(name_or_id)
+        envs, _, _ = await self.ql_api.get_envs(name_or_id)
         
         if not envs:
             yield event.plain_result(f"❌ 未找到环境变量: {name_or_id}")
@@ -416,126 +778,162 @@ class QinglongPlugin(Star):
         
         env = envs[0]
         success, msg = await self.ql_api.update_env(env['id'], name_or_id, value, env.get('remarks', ''))
-        yield event.plain_result(f"{'✅' if success else '❌'} {msg}: {name_or_id}")
+        yield event.plain_result(f"{RESULT_ICON[success]} {msg}: {name_or_id}")
     
-    async def _handle_delete_env(self, event: AstrMessageEvent, parts: list):
+    async def _handle_delete_env(self, event: AstrMessageEvent, ctx: SimpleNamespace):
         """删除环境变量"""
+        parts = ctx.parts
         if len(parts) < 3:
-            yield event.plain_result("使用方法: /ql delete <变量名>")
+            yield event.plain_result("使用方法: /ql delete <变量名> [变量名...]")
             return
-        
-        name = parts[2]
-        envs = await self.ql_api.get_envs(name)
-        
-        if not envs:
-            yield event.plain_result(f"❌ 未找到环境变量: {name}")
+
+        names = parts[2:]
+        results = await asyncio.gather(*(self.ql_api.get_envs(name) for name in names))
+
+        # 与单个删除时的语义一致：每个名称只删第一个匹配项
+        env_ids = [envs[0]['id'] for envs, _, _ in results if envs]
+        missing = [name for name, (envs, _, _) in zip(names, results) if not envs]
+
+        if not env_ids:
+            yield event.plain_result(f"❌ 未找到环境变量: {', '.join(names)}")
             return
-        
-        success, msg = await self.ql_api.delete_env(envs[0]['id'])
-        yield event.plain_result(f"{'✅' if success else '❌'} {msg}: {name}")
+
+        success, msg = await self.ql_api.delete_env(env_ids)
+        result = f"{RESULT_ICON[success]} {msg}: {', '.join(names)}"
+        if missing:
+            result += f"\n⚠️ 未找到: {', '.join(missing)}"
+        yield event.plain_result(result)
     
-    async def _handle_enable_env(self, event: AstrMessageEvent, parts: list):
+    async def _lookup_env_ids(self, names: List[str]) -> Tuple[List[int], List[str]]:
+        """并发查询多个变量名，返回 (命中的id列表, 未找到的名称列表)"""
+        results = await asyncio.gather(*(self.ql_api.get_envs(name) for name in names))
+        env_ids = [env['id'] for envs, _, _ in results for env in envs]
+        missing = [name for name, (envs, _, _) in zip(names, results) if not envs]
+        return env_ids, missing
+
+    async def _handle_enable_env(self, event: AstrMessageEvent, ctx: SimpleNamespace):
         """启用环境变量"""
+        parts = ctx.parts
         if len(parts) < 3:
-            yield event.plain_result("使用方法: /ql enable <变量名>")
+            yield event.plain_result("使用方法: /ql enable <变量名> [变量名...]")
             return
-        
-        name = parts[2]
-        envs = await self.ql_api.get_envs(name)
-        
-        if not envs:
-            yield event.plain_result(f"❌ 未找到环境变量: {name}")
+
+        names = parts[2:]
+        env_ids, missing = await self._lookup_env_ids(names)
+
+        if not env_ids:
+            yield event.plain_result(f"❌ 未找到环境变量: {', '.join(names)}")
             return
-        
-        success, msg = await self.ql_api.enable_env([env['id'] for env in envs])
-        yield event.plain_result(f"{'✅' if success else '❌'} {msg}: {name}")
-    
-    async def _handle_disable_env(self, event: AstrMessageEvent, parts: list):
+
+        success, msg = await self.ql_api.enable_env(env_ids)
+        result = f"{RESULT_ICON[success]} {msg}: {', '.join(names)}"
+        if missing:
+            result += f"\n⚠️ 未找到: {', '.join(missing)}"
+        yield event.plain_result(result)
+
+    async def _handle_disable_env(self, event: AstrMessageEvent, ctx: SimpleNamespace):
         """禁用环境变量"""
+        parts = ctx.parts
         if len(parts) < 3:
-            yield event.plain_result("使用方法: /ql disable <变量名>")
+            yield event.plain_result("使用方法: /ql disable <变量名> [变量名...]")
             return
-        
-        name = parts[2]
-        envs = await self.ql_api.get_envs(name)
-        
-        if not envs:
-            yield event.plain_result(f"❌ 未找到环境变量: {name}")
+
+        names = parts[2:]
+        env_ids, missing = await self._lookup_env_ids(names)
+
+        if not env_ids:
+            yield event.plain_result(f"❌ 未找到环境变量: {', '.join(names)}")
             return
-        
-        success, msg = await self.ql_api.disable_env([env['id'] for env in envs])
-        yield event.plain_result(f"{'✅' if success else '❌'} {msg}: {name}")
+
+        success, msg = await self.ql_api.disable_env(env_ids)
+        result = f"{RESULT_ICON[success]} {msg}: {', '.join(names)}"
+        if missing:
+            result += f"\n⚠️ 未找到: {', '.join(missing)}"
+        yield event.plain_result(result)
     
-    async def _handle_crons(self, event: AstrMessageEvent, parts: list):
+    async def _handle_crons(self, event: AstrMessageEvent, ctx: SimpleNamespace):
         """查看定时任务列表"""
+        parts = ctx.parts
         page = 1
         if len(parts) > 2 and parts[2].isdigit():
             page = int(parts[2])
         
-        crons = await self.ql_api.get_crons()
-        
-        if not crons:
+        crons, total, paginated = await self.ql_api.get_crons(page=page, size=self.PAGE_SIZE)
+
+        if not crons and not total:
             yield event.plain_result("📭 暂无定时任务")
             return
-        
-        total = len(crons)
-        start = (page - 1) * self.PAGE_SIZE
-        page_crons = crons[start:start + self.PAGE_SIZE]
-        
+
+        if not paginated:
+            # 服务端未做分页（旧版本面板），退回本地切片
+            total = len(crons)
+            start = (page - 1) * self.PAGE_SIZE
+            page_crons = crons[start:start + self.PAGE_SIZE]
+        else:
+            page_crons = crons
+
+        total_pages = -(-total // self.PAGE_SIZE)
         if not page_crons:
-            yield event.plain_result(f"❌ 页码超出范围 (共 {(total + self.PAGE_SIZE - 1) // self.PAGE_SIZE} 页)")
+            yield event.plain_result(f"❌ 页码超出范围 (共 {total_pages} 页)")
             return
-        
-        result = f"📋 定时任务列表 (第 {page} 页，共 {total} 个):\n\n"
+
+        lines = [f"📋 定时任务列表 (第 {page} 页，共 {total} 个):\n\n"]
         for cron in page_crons:
-            status = "🟢" if cron.get('status') == 0 else "🔴"
+            status = STATUS_ICON[0 if cron.get('status') == 0 else 1]
             cmd = cron.get('command', '')
-            result += f"{status} {cron.get('name', '未命名')}\n"
-            result += f"  ID: {cron.get('id')}\n"
-            result += f"  命令: {cmd[:50]}{'...' if len(cmd) > 50 else ''}\n"
-            result += f"  定时: {cron.get('schedule', '无')}\n\n"
-        
-        total_pages = (total + self.PAGE_SIZE - 1) // self.PAGE_SIZE
+            lines.append(f"{status} {cron.get('name', '未命名')}\n")
+            lines.append(f"  ID: {cron.get('id')}\n")
+            lines.append(f"  命令: {cmd[:50]}{'...' if len(cmd) > 50 else ''}\n")
+            lines.append(f"  定时: {cron.get('schedule', '无')}\n\n")
+
         if page < total_pages:
-            result += f"💡 使用 /ql ls {page + 1} 查看下一页"
-        
-        yield event.plain_result(result)
+            lines.append(f"💡 使用 /ql ls {page + 1} 查看下一页")
+
+        yield event.plain_result("".join(lines))
     
-    async def _handle_run_cron(self, event: AstrMessageEvent, parts: list):
+    async def _handle_run_cron(self, event: AstrMessageEvent, ctx: SimpleNamespace):
         """执行定时任务"""
+        parts = ctx.parts
         if len(parts) < 3:
-            yield event.plain_result("使用方法: /ql run <任务ID>")
+            yield event.plain_result("使用方法: /ql run <任务ID> [任务ID...]")
             return
-        
+
         try:
-            cron_id = int(parts[2])
+            cron_ids = self._parse_ids(parts[2:])
         except ValueError:
+            cron_ids = []
+        if not cron_ids:
             yield event.plain_result("❌ 任务ID必须是数字")
             return
-        
-        success, msg = await self.ql_api.run_cron([cron_id])
+
+        success, msg = await self.ql_api.run_cron(cron_ids)
+        ids_text = ", ".join(map(str, cron_ids))
         if success:
-            yield event.plain_result(f"✅ 已启动任务: {cron_id}\n💡 使用 /ql log {cron_id} 查看日志")
+            yield event.plain_result(f"✅ 已启动任务: {ids_text}\n💡 使用 /ql log {cron_ids[0]} 查看日志")
         else:
             yield event.plain_result(f"❌ 执行失败: {msg}")
     
-    async def _handle_stop_cron(self, event: AstrMessageEvent, parts: list):
+    async def _handle_stop_cron(self, event: AstrMessageEvent, ctx: SimpleNamespace):
         """停止定时任务"""
+        parts = ctx.parts
         if len(parts) < 3:
-            yield event.plain_result("使用方法: /ql stop <任务ID>")
+            yield event.plain_result("使用方法: /ql stop <任务ID> [任务ID...]")
             return
-        
+
         try:
-            cron_id = int(parts[2])
+            cron_ids = self._parse_ids(parts[2:])
         except ValueError:
+            cron_ids = []
+        if not cron_ids:
             yield event.plain_result("❌ 任务ID必须是数字")
             return
-        
-        success, msg = await self.ql_api.stop_cron([cron_id])
-        yield event.plain_result(f"{'✅ 已停止任务' if success else '❌ 停止失败'}: {cron_id}")
+
+        success, msg = await self.ql_api.stop_cron(cron_ids)
+        yield event.plain_result(f"{'✅ 已停止任务' if success else '❌ 停止失败'}: {', '.join(map(str, cron_ids))}")
     
-    async def _handle_cron_log(self, event: AstrMessageEvent, parts: list):
+    async def _handle_cron_log(self, event: AstrMessageEvent, ctx: SimpleNamespace):
         """查看任务日志"""
+        parts = ctx.parts
         if len(parts) < 3:
             yield event.plain_result("使用方法: /ql log <任务ID>")
             return
@@ -555,43 +953,36 @@ class QinglongPlugin(Star):
         if not log_content:
             yield event.plain_result(f"📝 任务 {cron_id} 暂无日志")
             return
-        
-        if len(log_content) > 1000:
-            log_content = "...\n" + log_content[-1000:]
-        
+
         yield event.plain_result(f"📝 任务 {cron_id} 日志:\n\n{log_content}")
     
-    async def _handle_cron_action(self, event: AstrMessageEvent, parts: list):
+    async def _handle_cron_action(self, event: AstrMessageEvent, ctx: SimpleNamespace):
         """定时任务操作（启用/禁用/置顶/删除）"""
+        parts = ctx.parts
         if len(parts) < 4:
-            yield event.plain_result("使用方法:\n/ql cron enable/disable <任务ID>\n/ql cron pin/unpin <任务ID>\n/ql cron delete <任务ID>")
+            yield event.plain_result("使用方法:\n/ql cron enable/disable <任务ID...>\n/ql cron pin/unpin <任务ID...>\n/ql cron delete <任务ID...>")
             return
-        
+
         action = parts[2].lower()
         try:
-            cron_id = int(parts[3])
+            cron_ids = self._parse_ids(parts[3:])
         except ValueError:
+            cron_ids = []
+        if not cron_ids:
             yield event.plain_result("❌ 任务ID必须是数字")
             return
-        
-        actions = {
-            "enable": (self.ql_api.enable_cron, "启用"),
-            "disable": (self.ql_api.disable_cron, "禁用"),
-            "pin": (self.ql_api.pin_cron, "置顶"),
-            "unpin": (self.ql_api.unpin_cron, "取消置顶"),
-            "delete": (self.ql_api.delete_cron, "删除"),
-        }
-        
-        if action not in actions:
+
+        entry = self._CRON_ACTIONS.get(action)
+        if entry is None:
             yield event.plain_result(f"❌ 未知操作: {action}\n支持: enable, disable, pin, unpin, delete")
             return
-        
-        func, action_name = actions[action]
-        success, msg = await func([cron_id])
-        icon = "📌" if action in ("pin", "unpin") else ("✅" if success else "❌")
-        yield event.plain_result(f"{icon} {action_name}任务 {cron_id}: {msg}")
+
+        method_name, action_name = entry
+        success, msg = await getattr(self.ql_api, method_name)(cron_ids)
+        icon = "📌" if action in _PIN_ACTIONS else ("✅" if success else "❌")
+        yield event.plain_result(f"{icon} {action_name}任务 {', '.join(map(str, cron_ids))}: {msg}")
     
-    async def _handle_info(self, event: AstrMessageEvent, parts: list):
+    async def _handle_info(self, event: AstrMessageEvent, ctx: SimpleNamespace):
         """查看系统信息"""
         system_info = await self.ql_api.get_system_info()
         
@@ -599,19 +990,19 @@ class QinglongPlugin(Star):
             yield event.plain_result("❌ 获取系统信息失败")
             return
         
-        result = "📊 青龙面板系统信息:\n\n"
-        
+        lines = ["📊 青龙面板系统信息:\n\n"]
+
         if 'version' in system_info:
-            result += f"🖥️ 版本: {system_info['version']}"
+            lines.append(f"🖥️ 版本: {system_info['version']}")
             if 'branch' in system_info:
-                result += f" ({system_info['branch']})"
-            result += "\n"
-        
+                lines.append(f" ({system_info['branch']})")
+            lines.append("\n")
+
         if 'isInitialized' in system_info:
             status = "✅ 已初始化" if system_info['isInitialized'] else "⚠️ 未初始化"
-            result += f"📌 状态: {status}\n"
-        
-        yield event.plain_result(result)
+            lines.append(f"📌 状态: {status}\n")
+
+        yield event.plain_result("".join(lines))
     
     async def terminate(self):
         """插件卸载时调用"""